@@ -1,276 +1,390 @@
-from fastapi import FastAPI, Request
+import gzip
+from contextlib import asynccontextmanager
+
+import orjson
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 import numpy as np
+from scipy import signal as scipy_signal
+from scipy.fft import rfft, rfftfreq, set_workers
+from scipy.ndimage import uniform_filter1d
+
+
+# Time axes and derived 2*pi*t phase vectors are fixed per endpoint, and
+# the bandpass coefficients never change, so build them once at import.
+# Everything runs in float32: plenty of precision for browser plotting,
+# and half the memory traffic through the FFT/filter/serialization path.
+_T_2S_1KHZ = np.linspace(0, 2, 2000, endpoint=False, dtype=np.float32)
+_T_1S_500HZ = np.linspace(0, 1, 500, endpoint=False, dtype=np.float32)
+_T_4S_1KHZ = np.linspace(0, 4, 4000, endpoint=False, dtype=np.float32)
+_T_1S_1KHZ = np.linspace(0, 1, 1000, endpoint=False, dtype=np.float32)
+_T_10S_100HZ = np.linspace(0, 10, 1000, endpoint=False, dtype=np.float32)
+_T_2S_500HZ = np.linspace(0, 2, 1000, endpoint=False, dtype=np.float32)
+
+_TWO_PI_T_2S_1KHZ = 2 * np.pi * _T_2S_1KHZ
+_TWO_PI_T_1S_500HZ = 2 * np.pi * _T_1S_500HZ
+_TWO_PI_T_4S_1KHZ = 2 * np.pi * _T_4S_1KHZ
+_TWO_PI_T_1S_1KHZ = 2 * np.pi * _T_1S_1KHZ
+_TWO_PI_T_10S_100HZ = 2 * np.pi * _T_10S_100HZ
+_TWO_PI_T_2S_500HZ = 2 * np.pi * _T_2S_500HZ
+
+# One reusable noise pool, drawn once at import (PCG64 via default_rng);
+# helpers take scaled views of the size they need. Largest payload is 3
+# channels of 4s @ 1kHz.
+_NOISE = np.random.default_rng(0).standard_normal((3, 4000), dtype=np.float32)
+
+# Welch analysis window, shared across calls
+_HANN_1024 = scipy_signal.get_window('hann', 1024).astype(np.float32)
+
+# Bandpass filter around 60Hz (40-80Hz)
+_SOS_BANDPASS = scipy_signal.butter(4, [40, 80], 'bandpass', fs=1000, output='sos').astype(np.float32)
+
+def _synth(two_pi_t, components, noise_scale):
+    """Synthesize channels as one (n_channels, n) array of summed sines + noise.
+
+    ``components`` holds the (amplitude, frequency) sine terms per channel.
+    All terms are evaluated with a single np.sin over the stacked
+    (n_terms, n) phase matrix, and the per-channel sums reduce to one
+    small matmul with the amplitude matrix.
+    """
+    freqs = np.array([freq for terms in components for _, freq in terms],
+                     dtype=np.float32)
+    amps = np.zeros((len(components), freqs.size), dtype=np.float32)
+    term = 0
+    for channel, terms in enumerate(components):
+        for amp, _ in terms:
+            amps[channel, term] = amp
+            term += 1
+
+    out = _NOISE[:len(components), :two_pi_t.size] * noise_scale
+    out += amps @ np.sin(np.outer(freqs, two_pi_t))
+    return out
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Pre-encode every payload once at startup.
+
+    The payloads are deterministic, so each request is served as a lookup
+    plus send of the cached JSON bytes.
+    """
+    # welch delegates to pocketfft internally; let it use all cores
+    # while the payloads are built
+    with set_workers(-1):
+        payloads = {name: compute() for name, compute in _PAYLOAD_HELPERS.items()}
+    app.state.cached_responses = {
+        name: orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+        for name, payload in payloads.items()
+    }
+    # Binary twins for clients that prefer raw Float32Array data over JSON
+    app.state.cached_binary = {
+        name: _encode_binary(payload["data"])
+        for name, payload in payloads.items()
+    }
+    # Repetitive float text compresses well; do it once here rather than
+    # per request in a compression middleware
+    app.state.cached_responses_gzip = {
+        name: gzip.compress(body, mtime=0)
+        for name, body in app.state.cached_responses.items()
+    }
+    yield
 
-app = FastAPI(title="uPlot Playground - Signal Processing")
+
+app = FastAPI(title="uPlot Playground - Signal Processing",
+              default_response_class=ORJSONResponse,
+              lifespan=lifespan)
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
 
+def _encode_binary(data):
+    """Pack data arrays as [u32 header length][JSON header][float32 values].
+
+    The header lists the field names and per-field lengths so a client can
+    split one Float32Array over the concatenated payload - no per-value
+    text formatting or parsing on either side.
+    """
+    header = orjson.dumps({
+        "dtype": "float32",
+        "fields": [{"name": name, "length": arr.size} for name, arr in data.items()],
+    })
+    blobs = b"".join(np.ascontiguousarray(arr, dtype=np.float32).tobytes()
+                     for arr in data.values())
+    return len(header).to_bytes(4, "little") + header + blobs
+
+
+def _cached_response(request: Request, name: str) -> Response:
+    """Serve startup-cached JSON bytes, gzip-encoded when the client accepts it"""
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(request.app.state.cached_responses_gzip[name],
+                        media_type="application/json",
+                        headers={"content-encoding": "gzip",
+                                 "vary": "Accept-Encoding"})
+    return Response(request.app.state.cached_responses[name],
+                    media_type="application/json")
+
+
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     return templates.TemplateResponse(request, "index.html")
 
 
-@app.get("/api/signal")
-async def get_signal():
-    """Generate composite 3-channel signal in time domain"""
+def _compute_signal():
+    """Compute the composite 3-channel signal payload"""
     sample_rate = 1000  # Hz
-    duration = 2  # seconds
-    n_samples = sample_rate * duration
 
-    t = np.linspace(0, duration, n_samples, endpoint=False)
-
-    # Channel 1: Low frequency dominant (50Hz + harmonics)
-    ch1 = (
-        np.sin(2 * np.pi * 50 * t) +
-        0.3 * np.sin(2 * np.pi * 150 * t) +
-        0.1 * np.random.randn(n_samples)
-    )
-
-    # Channel 2: Mid frequency dominant (120Hz + harmonics)
-    ch2 = (
-        0.8 * np.sin(2 * np.pi * 120 * t) +
-        0.4 * np.sin(2 * np.pi * 60 * t) +
-        0.1 * np.random.randn(n_samples)
-    )
-
-    # Channel 3: High frequency dominant (200Hz + harmonics)
-    ch3 = (
-        0.6 * np.sin(2 * np.pi * 200 * t) +
-        0.3 * np.sin(2 * np.pi * 100 * t) +
-        0.1 * np.random.randn(n_samples)
-    )
-
-    # Downsample for plotting (every 2nd point)
-    step = 2
+    # Plotting only ever used every 2nd sample, so synthesize directly on
+    # the decimated 500Hz grid instead of generating 2x and striding
+    t = _T_2S_500HZ
+    two_pi_t = _TWO_PI_T_2S_500HZ
+
+    sig = _synth(two_pi_t, (
+        ((1.0, 50), (0.3, 150)),    # Channel 1: Low frequency dominant
+        ((0.8, 120), (0.4, 60)),    # Channel 2: Mid frequency dominant
+        ((0.6, 200), (0.3, 100)),   # Channel 3: High frequency dominant
+    ), noise_scale=0.1)
 
     return {
         "data": {
-            "time": t[::step].tolist(),
-            "ch1": ch1[::step].tolist(),
-            "ch2": ch2[::step].tolist(),
-            "ch3": ch3[::step].tolist()
+            "time": t,
+            "ch1": sig[0],
+            "ch2": sig[1],
+            "ch3": sig[2]
         },
         "sample_rate": sample_rate,
         "labels": ["Channel 1 (50Hz)", "Channel 2 (120Hz)", "Channel 3 (200Hz)"]
     }
 
 
-@app.get("/api/fft")
-async def get_fft():
-    """Generate 3-channel FFT for frequency domain analysis"""
+@app.get("/api/signal")
+async def get_signal(request: Request):
+    """Generate composite 3-channel signal in time domain"""
+    return _cached_response(request, "signal")
+
+
+def _compute_fft():
+    """Compute the 3-channel FFT payload"""
     sample_rate = 1000  # Hz
     duration = 2  # seconds
     n_samples = sample_rate * duration
 
-    t = np.linspace(0, duration, n_samples, endpoint=False)
-
-    # Channel 1: Low frequency
-    ch1_signal = np.sin(2 * np.pi * 50 * t) + 0.3 * np.sin(2 * np.pi * 150 * t) + 0.1 * np.random.randn(n_samples)
+    t = _T_2S_1KHZ
+    two_pi_t = _TWO_PI_T_2S_1KHZ
 
-    # Channel 2: Mid frequency
-    ch2_signal = 0.8 * np.sin(2 * np.pi * 120 * t) + 0.4 * np.sin(2 * np.pi * 60 * t) + 0.1 * np.random.randn(n_samples)
+    sig = _synth(two_pi_t, (
+        ((1.0, 50), (0.3, 150)),    # Channel 1: Low frequency
+        ((0.8, 120), (0.4, 60)),    # Channel 2: Mid frequency
+        ((0.6, 200), (0.3, 100)),   # Channel 3: High frequency
+    ), noise_scale=0.1)
 
-    # Channel 3: High frequency
-    ch3_signal = 0.6 * np.sin(2 * np.pi * 200 * t) + 0.3 * np.sin(2 * np.pi * 100 * t) + 0.1 * np.random.randn(n_samples)
-
-    # Compute FFT for each channel
-    def compute_fft(signal):
-        fft = np.fft.fft(signal)
-        freqs = np.fft.fftfreq(n_samples, 1/sample_rate)
-        positive_mask = freqs >= 0
-        return freqs[positive_mask], np.abs(fft[positive_mask])
-
-    freqs, mag1 = compute_fft(ch1_signal)
-    _, mag2 = compute_fft(ch2_signal)
-    _, mag3 = compute_fft(ch3_signal)
+    # Compute the one-sided FFT for all channels in a single batched call;
+    # rfft only produces the non-negative frequencies, so no masking needed
+    mags = np.abs(rfft(sig, axis=1, workers=-1))
+    freqs = rfftfreq(n_samples, 1/sample_rate).astype(np.float32)
 
     # Downsample for plotting
     step = 5
 
     return {
         "data": {
-            "freq": freqs[::step].tolist(),
-            "ch1": mag1[::step].tolist(),
-            "ch2": mag2[::step].tolist(),
-            "ch3": mag3[::step].tolist()
+            "freq": np.ascontiguousarray(freqs[::step]),
+            "ch1": np.ascontiguousarray(mags[0, ::step]),
+            "ch2": np.ascontiguousarray(mags[1, ::step]),
+            "ch3": np.ascontiguousarray(mags[2, ::step])
         },
         "labels": ["FFT Ch1 (50Hz)", "FFT Ch2 (120Hz)", "FFT Ch3 (200Hz)"],
         "sample_rate": sample_rate
     }
 
 
-@app.get("/api/filtering")
-async def get_filtering():
-    """Generate 3-channel filtered signal"""
+@app.get("/api/fft")
+async def get_fft(request: Request):
+    """Generate 3-channel FFT for frequency domain analysis"""
+    return _cached_response(request, "fft")
+
+
+def _compute_filtering():
+    """Compute the 3-channel filtered signal payload"""
     sample_rate = 500  # Hz
     duration = 1  # second
     n_samples = sample_rate * duration
 
-    t = np.linspace(0, duration, n_samples, endpoint=False)
-
-    # Channel 1: Low frequency signal + noise
-    ch1_clean = np.sin(2 * np.pi * 10 * t)
-    ch1_noise = 0.5 * np.sin(2 * np.pi * 150 * t) + 0.2 * np.random.randn(n_samples)
-    ch1 = ch1_clean + ch1_noise
+    t = _T_1S_500HZ
+    two_pi_t = _TWO_PI_T_1S_500HZ
 
-    # Channel 2: Mid frequency signal + noise
-    ch2_clean = 0.8 * np.sin(2 * np.pi * 15 * t)
-    ch2_noise = 0.4 * np.sin(2 * np.pi * 120 * t) + 0.2 * np.random.randn(n_samples)
-    ch2 = ch2_clean + ch2_noise
+    sig = _synth(two_pi_t, (
+        ((1.0, 10), (0.5, 150)),    # Channel 1: Low frequency + interference
+        ((0.8, 15), (0.4, 120)),    # Channel 2: Mid frequency + interference
+        ((0.6, 8), (0.3, 100)),     # Channel 3: Different frequency + interference
+    ), noise_scale=0.2)
 
-    # Channel 3: Different frequency + noise
-    ch3_clean = 0.6 * np.sin(2 * np.pi * 8 * t)
-    ch3_noise = 0.3 * np.sin(2 * np.pi * 100 * t) + 0.2 * np.random.randn(n_samples)
-    ch3 = ch3_clean + ch3_noise
-
-    # Simple low-pass filter for each channel
+    # Simple low-pass filter, applied to all channels in one batched call.
+    # uniform_filter1d is a rolling-sum box filter: O(n) per channel
+    # instead of the O(n * window) of an explicit convolution.
     window_size = 15
-    ch1_filtered = np.convolve(ch1, np.ones(window_size)/window_size, mode='same')
-    ch2_filtered = np.convolve(ch2, np.ones(window_size)/window_size, mode='same')
-    ch3_filtered = np.convolve(ch3, np.ones(window_size)/window_size, mode='same')
+    filtered = uniform_filter1d(sig, size=window_size, axis=1, mode='constant')
 
     # Downsample for plotting
     step = 2
 
     return {
         "data": {
-            "time": t[::step].tolist(),
-            "ch1": ch1_filtered[::step].tolist(),
-            "ch2": ch2_filtered[::step].tolist(),
-            "ch3": ch3_filtered[::step].tolist()
+            "time": np.ascontiguousarray(t[::step]),
+            "ch1": np.ascontiguousarray(filtered[0, ::step]),
+            "ch2": np.ascontiguousarray(filtered[1, ::step]),
+            "ch3": np.ascontiguousarray(filtered[2, ::step])
         },
         "labels": ["Filtered Ch1", "Filtered Ch2", "Filtered Ch3"],
         "sample_rate": sample_rate
     }
 
 
-@app.get("/api/psd")
-async def get_psd():
-    """Generate 3-channel Power Spectral Density"""
+@app.get("/api/filtering")
+async def get_filtering(request: Request):
+    """Generate 3-channel filtered signal"""
+    return _cached_response(request, "filtering")
+
+
+def _compute_psd():
+    """Compute the 3-channel Power Spectral Density payload"""
     sample_rate = 1000  # Hz
     duration = 4  # seconds
     n_samples = sample_rate * duration
 
-    t = np.linspace(0, duration, n_samples, endpoint=False)
-
-    # Channel 1: Low frequency components
-    ch1 = 2.0 * np.sin(2 * np.pi * 50 * t) + 1.0 * np.sin(2 * np.pi * 150 * t) + 0.5 * np.random.randn(n_samples)
+    t = _T_4S_1KHZ
+    two_pi_t = _TWO_PI_T_4S_1KHZ
 
-    # Channel 2: Mid frequency components
-    ch2 = 1.5 * np.sin(2 * np.pi * 120 * t) + 0.8 * np.sin(2 * np.pi * 60 * t) + 0.5 * np.random.randn(n_samples)
+    sig = _synth(two_pi_t, (
+        ((2.0, 50), (1.0, 150)),    # Channel 1: Low frequency components
+        ((1.5, 120), (0.8, 60)),    # Channel 2: Mid frequency components
+        ((1.0, 200), (0.6, 100)),   # Channel 3: High frequency components
+    ), noise_scale=0.5)
 
-    # Channel 3: High frequency components
-    ch3 = 1.0 * np.sin(2 * np.pi * 200 * t) + 0.6 * np.sin(2 * np.pi * 100 * t) + 0.5 * np.random.randn(n_samples)
-
-    # Compute Power Spectral Density using Welch's method for each channel
-    from scipy import signal as scipy_signal
-    freqs, psd1 = scipy_signal.welch(ch1, sample_rate, nperseg=1024)
-    _, psd2 = scipy_signal.welch(ch2, sample_rate, nperseg=1024)
-    _, psd3 = scipy_signal.welch(ch3, sample_rate, nperseg=1024)
+    # Compute Power Spectral Density using Welch's method, all channels at once
+    freqs, psd = scipy_signal.welch(sig, sample_rate, window=_HANN_1024, axis=1)
+    freqs = freqs.astype(np.float32)
 
     return {
         "data": {
-            "freq": freqs.tolist(),
-            "ch1": psd1.tolist(),
-            "ch2": psd2.tolist(),
-            "ch3": psd3.tolist()
+            "freq": np.ascontiguousarray(freqs),
+            "ch1": np.ascontiguousarray(psd[0]),
+            "ch2": np.ascontiguousarray(psd[1]),
+            "ch3": np.ascontiguousarray(psd[2])
         },
         "labels": ["PSD Ch1", "PSD Ch2", "PSD Ch3"],
         "sample_rate": sample_rate
     }
 
 
-@app.get("/api/bandpass")
-async def get_bandpass():
-    """Generate 3-channel bandpass filtered signal"""
+@app.get("/api/psd")
+async def get_psd(request: Request):
+    """Generate 3-channel Power Spectral Density"""
+    return _cached_response(request, "psd")
+
+
+def _compute_bandpass():
+    """Compute the 3-channel bandpass filtered signal payload"""
     sample_rate = 1000  # Hz
     duration = 1  # second
     n_samples = sample_rate * duration
 
-    t = np.linspace(0, duration, n_samples, endpoint=False)
-
-    # Channel 1: Multiple frequencies, filter around 60Hz
-    ch1 = (
-        np.sin(2 * np.pi * 10 * t) +
-        np.sin(2 * np.pi * 60 * t) +
-        np.sin(2 * np.pi * 200 * t) +
-        0.2 * np.random.randn(n_samples)
-    )
-
-    # Channel 2: Different frequency mix
-    ch2 = (
-        0.8 * np.sin(2 * np.pi * 15 * t) +
-        0.8 * np.sin(2 * np.pi * 65 * t) +
-        0.5 * np.sin(2 * np.pi * 180 * t) +
-        0.2 * np.random.randn(n_samples)
-    )
-
-    # Channel 3: Another frequency mix
-    ch3 = (
-        0.6 * np.sin(2 * np.pi * 20 * t) +
-        0.7 * np.sin(2 * np.pi * 70 * t) +
-        0.4 * np.sin(2 * np.pi * 220 * t) +
-        0.2 * np.random.randn(n_samples)
-    )
-
-    # Bandpass filter around 60Hz (40-80Hz) for each channel
-    from scipy import signal as scipy_signal
-    sos = scipy_signal.butter(4, [40, 80], 'bandpass', fs=sample_rate, output='sos')
-    ch1_filtered = scipy_signal.sosfilt(sos, ch1)
-    ch2_filtered = scipy_signal.sosfilt(sos, ch2)
-    ch3_filtered = scipy_signal.sosfilt(sos, ch3)
+    t = _T_1S_1KHZ
+    two_pi_t = _TWO_PI_T_1S_1KHZ
+
+    sig = _synth(two_pi_t, (
+        ((1.0, 10), (1.0, 60), (1.0, 200)),     # Channel 1: filter around 60Hz
+        ((0.8, 15), (0.8, 65), (0.5, 180)),     # Channel 2: Different frequency mix
+        ((0.6, 20), (0.7, 70), (0.4, 220)),     # Channel 3: Another frequency mix
+    ), noise_scale=0.2)
+
+    # Bandpass filter around 60Hz (40-80Hz), all channels in one call
+    filtered = scipy_signal.sosfilt(_SOS_BANDPASS, sig, axis=1)
 
     # Downsample
     step = 2
 
     return {
         "data": {
-            "time": t[::step].tolist(),
-            "ch1": ch1_filtered[::step].tolist(),
-            "ch2": ch2_filtered[::step].tolist(),
-            "ch3": ch3_filtered[::step].tolist()
+            "time": np.ascontiguousarray(t[::step]),
+            "ch1": np.ascontiguousarray(filtered[0, ::step]),
+            "ch2": np.ascontiguousarray(filtered[1, ::step]),
+            "ch3": np.ascontiguousarray(filtered[2, ::step])
         },
         "labels": ["Bandpass Ch1", "Bandpass Ch2", "Bandpass Ch3"],
         "sample_rate": sample_rate
     }
 
 
-@app.get("/api/accelerometer")
-async def get_accelerometer():
-    """Generate 3D accelerometer data (simulated motion)"""
+@app.get("/api/bandpass")
+async def get_bandpass(request: Request):
+    """Generate 3-channel bandpass filtered signal"""
+    return _cached_response(request, "bandpass")
+
+
+def _compute_accelerometer():
+    """Compute the 3D accelerometer payload"""
     sample_rate = 100  # Hz
     duration = 10  # seconds
     n_samples = sample_rate * duration
 
-    t = np.linspace(0, duration, n_samples, endpoint=False)
+    t = _T_10S_100HZ
+    two_pi_t = _TWO_PI_T_10S_100HZ
+
+    # Simulate 3D motion with multiple frequency components + noise,
+    # accumulated in place into one (3, n) stack
+    xyz = _NOISE[:3, :n_samples] * 0.1
 
-    # Simulate 3D motion with multiple frequency components + noise
     # X-axis: figure-8 pattern
-    x = np.sin(2 * np.pi * 0.5 * t) + 0.1 * np.random.randn(n_samples)
+    xyz[0] += np.sin(0.5 * two_pi_t)
 
     # Y-axis: circular motion with drift
-    y = np.cos(2 * np.pi * 0.5 * t) + 0.1 * t/duration + 0.1 * np.random.randn(n_samples)
+    xyz[1] += np.cos(0.5 * two_pi_t)
+    xyz[1] += (0.1 / duration) * t
 
     # Z-axis: oscillating up/down with some acceleration events
-    z = 0.5 * np.sin(2 * np.pi * 0.3 * t) + 0.2 * np.sin(2 * np.pi * 1.5 * t) + 0.1 * np.random.randn(n_samples)
+    xyz[2] += 0.5 * np.sin(0.3 * two_pi_t)
+    xyz[2] += 0.2 * np.sin(1.5 * two_pi_t)
 
     return {
         "data": {
-            "time": t.tolist(),
-            "x": x.tolist(),
-            "y": y.tolist(),
-            "z": z.tolist()
+            "time": t,
+            "x": xyz[0],
+            "y": xyz[1],
+            "z": xyz[2]
         },
         "sample_rate": sample_rate,
         "duration": duration
     }
 
 
+@app.get("/api/accelerometer")
+async def get_accelerometer(request: Request):
+    """Generate 3D accelerometer data (simulated motion)"""
+    return _cached_response(request, "accelerometer")
+
+
+@app.get("/api/{name}.bin")
+async def get_binary(request: Request, name: str):
+    """Binary (float32) variant of an /api/* payload, ~4x smaller than JSON"""
+    cached = request.app.state.cached_binary
+    if name not in cached:
+        raise HTTPException(status_code=404, detail=f"Unknown payload: {name}")
+    return Response(cached[name], media_type="application/octet-stream")
+
+
+_PAYLOAD_HELPERS = {
+    "signal": _compute_signal,
+    "fft": _compute_fft,
+    "filtering": _compute_filtering,
+    "psd": _compute_psd,
+    "bandpass": _compute_bandpass,
+    "accelerometer": _compute_accelerometer,
+}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
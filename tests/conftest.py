@@ -3,25 +3,27 @@ import pytest
 import numpy as np
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_accelerometer_data():
-    """Generate sample accelerometer data for testing"""
+    """Sample accelerometer data, built once per test session"""
+    t = np.arange(0, 10, 0.01)
     return {
-        'time': np.arange(0, 10, 0.01),
-        'x': np.sin(np.arange(0, 10, 0.01) * 0.1),
-        'y': np.cos(np.arange(0, 10, 0.01) * 0.1),
-        'z': np.sin(np.arange(0, 10, 0.01) * 0.05)
+        'time': t,
+        'x': np.sin(t * 0.1),
+        'y': np.cos(t * 0.1),
+        'z': np.sin(t * 0.05)
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_signal_data():
-    """Generate sample signal data for testing"""
+    """Sample signal data, built once per test session"""
+    t = np.arange(0, 2, 0.001)
     return {
-        'time': np.arange(0, 2, 0.001),
-        'ch1': np.sin(np.arange(0, 2, 0.001) * 0.2),
-        'ch2': np.sin(np.arange(0, 2, 0.001) * 0.3),
-        'ch3': np.sin(np.arange(0, 2, 0.001) * 0.4)
+        'time': t,
+        'ch1': np.sin(t * 0.2),
+        'ch2': np.sin(t * 0.3),
+        'ch3': np.sin(t * 0.4)
     }
 
 
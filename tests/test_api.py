@@ -1,6 +1,8 @@
 """
 API endpoint tests using FastAPI TestClient
 """
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 from main import app
@@ -8,8 +10,9 @@ from main import app
 
 @pytest.fixture
 def client():
-    """Create a test client"""
-    return TestClient(app)
+    """Create a test client (context manager runs the startup lifespan)"""
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 class TestAPIEndpoints:
@@ -71,6 +74,28 @@ class TestAPIEndpoints:
         data = response.json()
         assert "data" in data
     
+    def test_binary_endpoint(self, client):
+        """Test /api/signal.bin returns a parseable float32 payload"""
+        response = client.get("/api/signal.bin")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/octet-stream"
+
+        body = response.content
+        header_len = int.from_bytes(body[:4], "little")
+        header = json.loads(body[4:4 + header_len])
+
+        assert header["dtype"] == "float32"
+        field_names = [field["name"] for field in header["fields"]]
+        assert field_names == ["time", "ch1", "ch2", "ch3"]
+
+        n_values = sum(field["length"] for field in header["fields"])
+        assert len(body) - 4 - header_len == n_values * 4
+
+    def test_binary_endpoint_unknown_name(self, client):
+        """Test 404 for a binary variant that doesn't exist"""
+        response = client.get("/api/nonexistent.bin")
+        assert response.status_code == 404
+
     def test_accelerometer_endpoint(self, client):
         """Test /api/accelerometer returns accelerometer data"""
         response = client.get("/api/accelerometer")
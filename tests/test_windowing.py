@@ -4,33 +4,58 @@ Test suite for windowing behavior
 This tests the core windowing logic that's implemented in JavaScript.
 The Python implementation mirrors the JS behavior for testing purposes.
 """
+import math
+
 import pytest
 import numpy as np
 from typing import Optional, Dict, Any
 
 
+# Shared datasets, built once at import: the window methods only ever
+# slice views, so every simulator instance can bind the same arrays
+_T_ACC = np.arange(0, 10, 0.01)
+_ACC_DATA = {
+    'time': _T_ACC,
+    'x': np.sin(_T_ACC * 0.1),
+    'y': np.cos(_T_ACC * 0.1),
+    'z': np.sin(_T_ACC * 0.05)
+}
+
+_T_SIG = np.arange(0, 2, 0.001)
+_SIG_DATA = {
+    'time': _T_SIG,
+    'ch1': np.sin(_T_SIG * 0.2),
+    'ch2': np.sin(_T_SIG * 0.3),
+    'ch3': np.sin(_T_SIG * 0.4)
+}
+
+
 class WindowingSimulator:
     """Simulates the windowing logic from charts.js"""
-    
+
     def __init__(self):
         self.current_window_size = 2.0
         self.active_chart = 'accelerometer'
         self.clicked_time: Optional[float] = None
-        
-        self.accelerometer_data = {
-            'time': np.arange(0, 10, 0.01),
-            'x': np.sin(np.arange(0, 10, 0.01) * 0.1),
-            'y': np.cos(np.arange(0, 10, 0.01) * 0.1),
-            'z': np.sin(np.arange(0, 10, 0.01) * 0.05)
-        }
-        
-        self.signal_data = {
-            'time': np.arange(0, 2, 0.001),
-            'ch1': np.sin(np.arange(0, 2, 0.001) * 0.2),
-            'ch2': np.sin(np.arange(0, 2, 0.001) * 0.3),
-            'ch3': np.sin(np.arange(0, 2, 0.001) * 0.4)
-        }
-    
+
+        self.accelerometer_data = _ACC_DATA
+        self.signal_data = _SIG_DATA
+
+        # Sample spacing of the (uniform) time grids, for O(1) index math
+        self._accel_dt = 0.01
+        self._signal_dt = 0.001
+
+    @staticmethod
+    def _window_indices(min_time: float, max_time: float, dt: float, n: int) -> tuple:
+        """Index range [start, end) covering [min_time, max_time] on a uniform grid.
+
+        Equivalent to np.searchsorted(time, min_time, 'left') /
+        np.searchsorted(time, max_time, 'right') for time = k*dt, but O(1).
+        """
+        start_idx = max(0, math.ceil(min_time / dt - 1e-9))
+        end_idx = min(n, math.floor(max_time / dt + 1e-9) + 1)
+        return start_idx, max(start_idx, end_idx)
+
     def get_windowed_data(self, chart_name: Optional[str] = None) -> Dict[str, Any]:
         """Get windowed data for the specified chart"""
         chart_name = chart_name or self.active_chart
@@ -53,15 +78,15 @@ class WindowingSimulator:
             half_window = self.current_window_size / 2
             min_time = max(0, self.clicked_time - half_window)
             max_time = self.clicked_time + half_window
-            
-            start_idx = np.searchsorted(time, min_time, side='left')
-            end_idx = np.searchsorted(time, max_time, side='right')
+
+            start_idx, end_idx = self._window_indices(
+                min_time, max_time, self._accel_dt, len(time))
         else:
             min_time = 0
             max_time = self.current_window_size
-            
-            start_idx = 0
-            end_idx = np.searchsorted(time, max_time, side='right')
+
+            start_idx, end_idx = self._window_indices(
+                min_time, max_time, self._accel_dt, len(time))
         
         window_time = time[start_idx:end_idx]
         
@@ -87,8 +112,8 @@ class WindowingSimulator:
             min_time = max(0, self.clicked_time - half_window)
             max_time = self.clicked_time + half_window
             
-            start_idx = np.searchsorted(time, min_time, side='left')
-            end_idx = np.searchsorted(time, max_time, side='right')
+            start_idx, end_idx = self._window_indices(
+                min_time, max_time, self._signal_dt, len(time))
         else:
             min_time = time[0]
             max_time = time[-1]